@@ -1,16 +1,30 @@
-from flask import Flask, render_template_string, jsonify, request
+from flask import Flask, Response, jsonify, request
 import boto3
+from botocore.config import Config as BotoConfig
 from datetime import datetime, timedelta
 from collections import defaultdict
 import json
 import os
+import gzip
+import html
 import ipaddress
 import argparse
+import bisect
 import sys
 import time
+import threading
 import re
+from contextlib import contextmanager
+from functools import lru_cache
+from types import SimpleNamespace
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:  # e.g. a Lambda package built on a platform without a matching wheel
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv('.env')
 
@@ -42,6 +56,8 @@ def get_config(variable_name, default=None):
 def parse_days_parameter(days_param):
     """
     Parse the days parameter, which can be a number or special value like 'mtd' or 'last-month'.
+    Numeric ranges start at midnight, so they cover whole days like the daily
+    buckets of the Insights query and Cost Explorer.
 
     Returns:
         tuple: (start_date, end_date) as datetime objects
@@ -63,15 +79,18 @@ def parse_days_parameter(days_param):
             days = int(days_param)
         except (ValueError, TypeError):
             days = 7  # Default to 7 days
-        start_date = end_date - timedelta(days=days)
+        start_date = (end_date - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
 
     return start_date, end_date
 
 app = Flask(__name__)
 
 # Query cache to avoid repeated CloudWatch Logs Insights queries
-_query_cache = {}
+# TTLCache bounds the number of entries and expires them itself; it isn't
+# thread-safe, so all access goes through _cache_lock
 _cache_ttl = 600  # 10 minutes cache TTL in seconds
+_query_cache = TTLCache(maxsize=64, ttl=_cache_ttl)
+_cache_lock = threading.RLock()
 
 def _get_cache_key(days):
     """Generate cache key based on days parameter (handles numeric and special values)"""
@@ -84,25 +103,95 @@ def _get_cache_key(days):
         cache_date = last_month.strftime('%Y-%m')
         return f"bedrock_usage_last_month_{cache_date}"
     else:
+        # Normalize like parse_days_parameter, so '07' or an invalid value
+        # share the entry of the range they resolve to
+        try:
+            days = int(days)
+        except (ValueError, TypeError):
+            days = 7
         return f"bedrock_usage_{days}"
 
 def _get_cached_query_id(days):
     """Get cached query ID if still valid"""
-    cache_key = _get_cache_key(days)
-    if cache_key in _query_cache:
-        entry = _query_cache[cache_key]
-        if time.time() - entry['timestamp'] < _cache_ttl:
-            return entry
-    return None
+    with _cache_lock:
+        return _query_cache.get(_get_cache_key(days))
 
 def _cache_query_id(days, query_id, status):
     """Cache a CloudWatch Logs Insights query ID"""
-    cache_key = _get_cache_key(days)
-    _query_cache[cache_key] = {
-        'query_id': query_id,
-        'status': status,
-        'timestamp': time.time()
-    }
+    with _cache_lock:
+        _query_cache[_get_cache_key(days)] = {
+            'query_id': query_id,
+            'status': status
+        }
+
+# Processed usage results, keyed like _query_cache, so repeat visits within the
+# TTL skip the CloudWatch query and Cost Explorer call entirely. Entries are
+# large, so fewer are kept.
+_results_cache = TTLCache(maxsize=16, ttl=_cache_ttl)
+
+def _get_cached_results(days):
+    """Get cached processed results if still valid"""
+    with _cache_lock:
+        return _results_cache.get(_get_cache_key(days))
+
+def _is_cacheable(data):
+    """Only complete results are cached: not errors, nor usage whose costs failed to load"""
+    return 'error' not in data and 'cost_error' not in data
+
+def _cache_results(days, data):
+    """Cache processed usage results"""
+    with _cache_lock:
+        _results_cache[_get_cache_key(days)] = data
+
+# One lock per cache key so concurrent requests (or a request racing the
+# prewarm thread) for the same range run the CloudWatch query only once.
+# Entries are [lock, users] and removed once unused, so arbitrary ?days=N
+# values don't accumulate.
+_fetch_locks = {}
+
+@contextmanager
+def _fetch_lock(days):
+    """Hold the fetch lock for a days parameter"""
+    key = _get_cache_key(days)
+    with _cache_lock:
+        entry = _fetch_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _cache_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _fetch_locks[key]
+
+# Longest time to wait for a CloudWatch Logs Insights query to complete
+_QUERY_MAX_WAIT = 60
+
+# Date ranges kept warm by the background prewarm thread
+_PREWARM_DAYS = ('1', '7', '30')
+
+def _prewarm_loop():
+    """
+    Re-fetch common date ranges shortly before their cache entries expire.
+    The sleep leaves room for a slow fetch (query plus Cost Explorer calls),
+    since entries only get their new TTL once the fetch completes.
+
+    A single Insights query over the widest range serves all of _PREWARM_DAYS;
+    the shorter ranges are derived from its daily buckets.
+    """
+    widest, *narrower = sorted(_PREWARM_DAYS, key=int, reverse=True)
+    while True:
+        with _fetch_lock(widest):
+            usage = _fetch_bedrock_usage(widest, narrower)
+        for days, data in usage.items():
+            if _is_cacheable(data):
+                _cache_results(days, data)
+        time.sleep(max(_cache_ttl - 2 * _QUERY_MAX_WAIT, 60))
+
+def start_cache_prewarm():
+    """Start the background thread that keeps the results cache warm"""
+    threading.Thread(target=_prewarm_loop, name='cache-prewarm', daemon=True).start()
 
 # Bedrock pricing (USD per Million tokens)
 # NOTE: These are Cross-Region Inference (CRI) prices on AWS Bedrock
@@ -239,6 +328,7 @@ def classify_claude_model(model_id):
     return None
 
 
+@lru_cache(maxsize=4096)
 def canonical_model_id(name):
     """
     Normalize a CloudWatch modelId OR a Cost Explorer service name to a single
@@ -304,6 +394,10 @@ INACTIVE_BEDROCK_PRICING = {
 
 
 
+# Cross-region inference profile prefixes
+_REGION_PREFIXES = ('us.', 'global.', 'eu.', 'ap.')
+
+@lru_cache(maxsize=4096)
 def strip_model_prefix(model_id):
     """
     Strip ARN prefix and region prefix from model ID.
@@ -319,16 +413,21 @@ def strip_model_prefix(model_id):
     """
     # First, strip ARN prefix (arn:aws:bedrock:region:account:inference-profile/)
     if ':inference-profile/' in model_id:
-        model_id = model_id.split(':inference-profile/', 1)[1]
+        model_id = model_id.partition(':inference-profile/')[2]
 
     # Then strip region prefix (us., global., eu., ap.)
-    if '.' in model_id:
-        parts = model_id.split('.', 1)
-        if parts[0] in {'us', 'global', 'eu', 'ap'}:  # Use set for O(1) lookup
-            return parts[1]
+    if model_id.startswith(_REGION_PREFIXES):
+        return model_id.partition('.')[2]
 
     return model_id
 
+# Precompiled patterns for get_model_display_name (called per model on every request)
+_CLAUDE_ID_RE = re.compile(
+    r'^anthropic\.claude-(haiku|sonnet|opus|fable)(?:-(\d+)(?:-(\d+))?)?(\[1m\])?$')
+_DATE_RE = re.compile(r'-\d{8}.*$')
+_VER_RE = re.compile(r'(?:-v\d:0|-\d:0)$')
+
+@lru_cache(maxsize=1024)
 def get_model_display_name(model_id):
     """
     Generate a clean display name for a model ID.
@@ -351,8 +450,7 @@ def get_model_display_name(model_id):
     # Fast path for canonical Claude ids ('anthropic.claude-<family>-<maj>-<min>'),
     # which is what usage/cost data uses. Render the version with a dot, e.g.
     # 'anthropic.claude-opus-4-7' -> 'Claude Opus 4.7', and keep the [1m] tag.
-    claude_match = re.match(
-        r'^anthropic\.claude-(haiku|sonnet|opus|fable)(?:-(\d+)(?:-(\d+))?)?(\[1m\])?$', model_id)
+    claude_match = _CLAUDE_ID_RE.match(model_id)
     if claude_match:
         family, maj, minor, onem = claude_match.groups()
         name = f'Claude {family.capitalize()}'
@@ -373,17 +471,17 @@ def get_model_display_name(model_id):
         clean_id = clean_id.replace('[1m]', '')
 
     # Step 2: Remove provider prefix (anthropic., openai., meta., cohere., etc.)
-    if '.' in clean_id:
-        parts = clean_id.split('.', 1)
-        clean_id = parts[1]
+    _, sep, rest = clean_id.partition('.')
+    if sep:
+        clean_id = rest
 
     # Step 3: Remove date suffix (e.g., -20240307, -20251025)
     # Pattern: -20YYMMDD or similar 8-digit date
-    clean_id = re.sub(r'-\d{8}.*$', '', clean_id)
+    clean_id, date_removed = _DATE_RE.subn('', clean_id)
 
     # Step 4: If no date was removed, remove version suffix (-v1:0, -v2:0, -1:0, -2:0)
-    if re.search(r'-\d{8}', model_id) is None:
-        clean_id = re.sub(r'(-v\d:0|-\d:0)$', '', clean_id)
+    if not date_removed:
+        clean_id = _VER_RE.sub('', clean_id)
 
     # Step 5: Replace hyphens and underscores with spaces
     display_name = clean_id.replace('-', ' ').replace('_', ' ')
@@ -397,8 +495,17 @@ def get_model_display_name(model_id):
 
     return display_name
 
+# Pricing keyed by prefix-stripped model id, built once for O(1) exact lookups
+_PRICING_BY_CLEAN = {strip_model_prefix(k): v for k, v in BEDROCK_PRICING.items()}
+
+@lru_cache(maxsize=1024)
 def get_model_pricing(model_id):
-    """Get pricing for a specific model"""
+    """
+    Get pricing for a specific model.
+
+    Cached per raw model id: the set of distinct ids is small, so the partial
+    match scan below runs at most once per model per process.
+    """
     # Claude models are priced by family (handles all current/future versions)
     claude_key = classify_claude_model(model_id)
     if claude_key is not None:
@@ -408,8 +515,8 @@ def get_model_pricing(model_id):
     clean_model_id = strip_model_prefix(model_id)
 
     # Try exact match first
-    if clean_model_id in BEDROCK_PRICING:
-        return BEDROCK_PRICING[clean_model_id]
+    if clean_model_id in _PRICING_BY_CLEAN:
+        return _PRICING_BY_CLEAN[clean_model_id]
 
     if model_id in BEDROCK_PRICING:
         return BEDROCK_PRICING[model_id]
@@ -447,17 +554,21 @@ def _get_code_updated_date():
 
 CODE_UPDATED_DATE = _get_code_updated_date()
 
-with open(os.path.join(template_dir, 'bedrock-usage-template.html'), 'r') as f:
-    HTML_TEMPLATE = f.read()
-
-with open(os.path.join(template_dir, 'bedrock-usage-template-pricing.html'), 'r') as f:
-    PRICING_TEMPLATE = f.read()
+def _load_template(filename):
+    """
+    Read and compile an HTML template file. Only the compiled template is kept,
+    so the raw HTML is not held in memory for the life of the process.
+    """
+    with open(os.path.join(template_dir, filename), 'r') as f:
+        return app.jinja_env.from_string(f.read())
 
-with open(os.path.join(template_dir, 'bedrock-usage-more-stats.html'), 'r') as f:
-    MORE_STATS_TEMPLATE = f.read()
+# Compile templates once at import instead of re-parsing them on every request
+_HTML_TMPL = _load_template('bedrock-usage-template.html')
+_PRICING_TMPL = _load_template('bedrock-usage-template-pricing.html')
+_MORE_STATS_TMPL = _load_template('bedrock-usage-more-stats.html')
 
-# Keep MATRIX_TEMPLATE for backward compatibility
-MATRIX_TEMPLATE = MORE_STATS_TEMPLATE
+# Keep the matrix template for backward compatibility
+_MATRIX_TMPL = _MORE_STATS_TMPL
 
 # VPN/Subnet access error page template
 VPN_ERROR_TEMPLATE = """
@@ -651,15 +762,107 @@ VPN_ERROR_TEMPLATE = """
 </html>
 """
 
+_VPN_ERROR_TMPL = app.jinja_env.from_string(VPN_ERROR_TEMPLATE)
+
+# The VPN error page only varies by client IP, so pre-render it around a
+# placeholder and splice the (escaped) IP in on the rejection path
+_VPN_IP_PLACEHOLDER = '__CLIENT_IP__'
+_VPN_PREFIX_BYTES, _VPN_SUFFIX_BYTES = (
+    part.encode() for part in
+    _VPN_ERROR_TMPL.render(client_ip=_VPN_IP_PLACEHOLDER).split(_VPN_IP_PLACEHOLDER, 1)
+)
+
+def _vpn_error_response(client_ip):
+    """Build the 403 VPN error page for a client IP without going through Jinja"""
+    body = _VPN_PREFIX_BYTES + html.escape(client_ip).encode() + _VPN_SUFFIX_BYTES
+    return Response(body, status=403, mimetype='text/html')
+
 # Get configuration from environment (with dashboard-specific overrides)
-SUBNETS_ONLY = get_config('SUBNETS_ONLY')
-AWS_PROFILE = get_config('AWS_PROFILE')
-AWS_ADMIN_PROFILE = get_config('AWS_ADMIN_PROFILE', AWS_PROFILE)
-FQDN = get_config('FQDN')
+# Resolved once at import; request handlers only read CFG attributes
+CFG = SimpleNamespace(
+    SUBNETS_ONLY=get_config('SUBNETS_ONLY'),
+    AWS_PROFILE=get_config('AWS_PROFILE'),
+    FQDN=get_config('FQDN'),
+    # Off by default: the prewarm thread queries CloudWatch and Cost Explorer
+    # every few minutes even when nobody is using the dashboard
+    PREWARM_CACHE=get_config('PREWARM_CACHE', 'false').lower() in ('1', 'true', 'yes'),
+)
+CFG.AWS_ADMIN_PROFILE = get_config('AWS_ADMIN_PROFILE', CFG.AWS_PROFILE)
+
+# Shared botocore settings: adaptive retries absorb CloudWatch Logs Insights
+# throttling (StartQuery is limited to a few requests per second)
+_BOTO_CONFIG = BotoConfig(retries={'max_attempts': 5, 'mode': 'adaptive'}, max_pool_connections=20)
+
+@lru_cache(maxsize=None)
+def _get_logs_client():
+    """CloudWatch Logs client, created on first use and reused afterwards"""
+    session = boto3.Session(profile_name=CFG.AWS_PROFILE) if CFG.AWS_PROFILE else boto3.Session()
+    return session.client('logs', config=_BOTO_CONFIG)
+
+@lru_cache(maxsize=None)
+def _get_ce_client():
+    """Cost Explorer client, created on first use and reused afterwards"""
+    session = boto3.Session(profile_name=CFG.AWS_ADMIN_PROFILE) if CFG.AWS_ADMIN_PROFILE else boto3.Session()
+    return session.client('ce', config=_BOTO_CONFIG)
+
+# Error text that means the credentials behind the cached clients are no good
+_CREDENTIAL_ERRORS = ('ExpiredToken', 'Unable to locate credentials',
+                      'InvalidClientTokenId', 'UnrecognizedClient')
+
+def _reset_aws_clients_on_credential_error(error_msg):
+    """
+    Drop the cached AWS clients after a credentials error, so the next request
+    builds a new session and picks up refreshed credentials without a restart.
+    """
+    if any(marker in error_msg for marker in _CREDENTIAL_ERRORS):
+        _get_logs_client.cache_clear()
+        _get_ce_client.cache_clear()
+
+def _parse_allowed_networks(subnets_only):
+    """
+    Parse the comma-separated SUBNETS_ONLY list (plus localhost) into
+    ip_network objects, split by IP version. Invalid entries are skipped.
+
+    Returns:
+        tuple: (IPv4 networks, IPv6 networks)
+    """
+    allowed_subnets = [s.strip() for s in (subnets_only or '').split(',') if s.strip()]
+
+    # Always allow localhost (127.0.0.1/8)
+    if '127.0.0.1/8' not in allowed_subnets and '127.0.0.0/8' not in allowed_subnets:
+        allowed_subnets.append('127.0.0.1/8')
+
+    networks = []
+    for subnet_str in allowed_subnets:
+        try:
+            networks.append(ipaddress.ip_network(subnet_str, strict=False))
+        except ValueError as ve:
+            print(f"WARNING: Invalid subnet in SUBNETS_ONLY: {subnet_str} - {ve}")
+
+    return (
+        tuple(n for n in networks if n.version == 4),
+        tuple(n for n in networks if n.version == 6),
+    )
+
+def _build_intervals(networks):
+    """
+    Collapse networks into sorted, non-overlapping integer address ranges.
+
+    Returns:
+        tuple: (range start list, range end list), for bisect lookups
+    """
+    collapsed = list(ipaddress.collapse_addresses(networks))
+    return [int(n.network_address) for n in collapsed], [int(n.broadcast_address) for n in collapsed]
+
+# Parsed once at import; the per-request check is a binary search over the
+# collapsed address ranges, so it stays O(log N) with many subnets configured
+_ALLOWED_NETS_V4, _ALLOWED_NETS_V6 = _parse_allowed_networks(CFG.SUBNETS_ONLY)
+_V4_STARTS, _V4_ENDS = _build_intervals(_ALLOWED_NETS_V4)
+_V6_STARTS, _V6_ENDS = _build_intervals(_ALLOWED_NETS_V6)
 
 def check_subnet_access():
     """Middleware to check if client IP is within allowed subnets (comma-separated list)"""
-    if not SUBNETS_ONLY:
+    if not CFG.SUBNETS_ONLY:
         # No subnet restriction configured
         return True
 
@@ -672,37 +875,23 @@ def check_subnet_access():
 
         if not client_ip:
             print("WARNING: Unable to determine client IP, denying access")
-            return render_template_string(
-                VPN_ERROR_TEMPLATE,
-                client_ip='unknown',
-                allowed_subnets='Unable to determine your IP'
-            ), 403
+            return _vpn_error_response('unknown')
 
         client_ip_obj = ipaddress.ip_address(client_ip)
 
-        # Parse comma-separated list of subnets and always include localhost
-        allowed_subnets = [s.strip() for s in SUBNETS_ONLY.split(',') if s.strip()]
-
-        # Always allow localhost (127.0.0.1/8)
-        if '127.0.0.1/8' not in allowed_subnets and '127.0.0.0/8' not in allowed_subnets:
-            allowed_subnets.append('127.0.0.1/8')
-
-        # Check if client IP is in any allowed subnet
-        for subnet_str in allowed_subnets:
-            try:
-                allowed_network = ipaddress.ip_network(subnet_str, strict=False)
-                if client_ip_obj in allowed_network:
-                    return True
-            except ValueError as ve:
-                print(f"WARNING: Invalid subnet in SUBNETS_ONLY: {subnet_str} - {ve}")
-                continue
+        # Check if client IP is in any allowed subnet of the same IP version:
+        # find the last range starting at or below the IP and check its end
+        if client_ip_obj.version == 4:
+            starts, ends = _V4_STARTS, _V4_ENDS
+        else:
+            starts, ends = _V6_STARTS, _V6_ENDS
+        ip_int = int(client_ip_obj)
+        i = bisect.bisect_right(starts, ip_int) - 1
+        if i >= 0 and ip_int <= ends[i]:
+            return True
 
         # IP is not in any allowed subnet
-        return render_template_string(
-            VPN_ERROR_TEMPLATE,
-            client_ip=client_ip,
-            allowed_subnets=', '.join(allowed_subnets)
-        ), 403
+        return _vpn_error_response(client_ip)
     except Exception as e:
         print(f"ERROR checking subnet access: {e}")
         return True  # Allow access if there's an error checking
@@ -962,6 +1151,10 @@ USER_MAP = {
     # 'john': ['john-dev', 'john-prod'],
 }
 
+# Reverse lookup of USER_MAP: alias -> primary username
+_ALIAS_TO_PRIMARY = {alias: primary for primary, aliases in USER_MAP.items() for alias in aliases}
+
+@lru_cache(maxsize=4096)
 def normalize_username(raw_user):
     """
     Normalize username by:
@@ -979,9 +1172,9 @@ def normalize_username(raw_user):
         return user
 
     # Check if this user is an alias for another user
-    for primary_user, aliases in USER_MAP.items():
-        if user in aliases:
-            return primary_user
+    primary_user = _ALIAS_TO_PRIMARY.get(user)
+    if primary_user is not None:
+        return primary_user
 
     # If it looks like an ARN or unidentifiable (contains 'arn:' or ':'), aggregate to 'Other'
     if ':' in user or user.startswith('arn'):
@@ -1006,8 +1199,7 @@ def get_cost_explorer_costs(start_time, end_time):
         dict with 'model_costs', 'daily_costs', 'model_daily_costs', 'total_cost'
     """
     try:
-        session = boto3.Session(profile_name=AWS_ADMIN_PROFILE) if AWS_ADMIN_PROFILE else boto3.Session()
-        ce_client = session.client('ce')
+        ce_client = _get_ce_client()
 
         # Format dates for Cost Explorer API (YYYY-MM-DD)
         start_date = start_time.strftime('%Y-%m-%d')
@@ -1076,6 +1268,7 @@ def get_cost_explorer_costs(start_time, end_time):
 
     except Exception as e:
         error_msg = str(e)
+        _reset_aws_clients_on_credential_error(error_msg)
         if 'AccessDenied' in error_msg:
             error_msg = f'Cost Explorer access denied. Required permission: ce:GetCostAndUsage. Error: {error_msg}'
         return {
@@ -1088,7 +1281,62 @@ def get_cost_explorer_costs(start_time, end_time):
         }
 
 
-def get_bedrock_usage(days=7):
+# Set once DescribeQueries is denied, so polling goes straight to
+# GetQueryResults instead of retrying (and warning) on every poll
+_describe_queries_denied = False
+
+def _get_query_status(logs_client, log_group_name, query_id):
+    """
+    Return the status of a Logs Insights query via DescribeQueries, which
+    doesn't transfer the result rows. Returns None if the query isn't listed
+    or DescribeQueries isn't permitted, so the caller can fall back to
+    GetQueryResults.
+    """
+    global _describe_queries_denied
+    if _describe_queries_denied:
+        return None
+    try:
+        response = logs_client.describe_queries(logGroupName=log_group_name, maxResults=50)
+    except Exception as e:
+        if 'AccessDenied' in str(e):
+            _describe_queries_denied = True
+        print(f"WARNING: describe_queries failed, falling back to get_query_results: {e}")
+        return None
+    for query in response.get('queries', []):
+        if query.get('queryId') == query_id:
+            return query.get('status')
+    return None
+
+def get_bedrock_usage(days=7, refresh=False):
+    """
+    Fetch Bedrock usage data, served from the results cache when possible.
+
+    Successful results are cached for _cache_ttl seconds; errors, including a
+    failed Cost Explorer lookup ('cost_error'), are not cached.
+    A shallow copy is returned so callers can add keys without touching the cache.
+
+    Args:
+        days: Can be a number (e.g., 7, 30, 90), 'mtd' for month-to-date, or 'last-month'
+        refresh: If True, bypass the cache and re-run the query
+    """
+    if not refresh:
+        cached = _get_cached_results(days)
+        if cached is not None:
+            return dict(cached)
+
+    with _fetch_lock(days):
+        # Another thread may have filled the cache while we waited for the lock
+        if not refresh:
+            cached = _get_cached_results(days)
+            if cached is not None:
+                return dict(cached)
+
+        data = _fetch_bedrock_usage(days)[days]
+        if _is_cacheable(data):
+            _cache_results(days, data)
+    return dict(data)
+
+def _fetch_bedrock_usage(days, narrower_days=()):
     """
     Fetch Bedrock usage data from CloudWatch Logs using Logs Insights queries.
 
@@ -1099,10 +1347,15 @@ def get_bedrock_usage(days=7):
 
     Args:
         days: Can be a number (e.g., 7, 30, 90), 'mtd' for month-to-date, or 'last-month'
+        narrower_days: Shorter numeric ranges to derive from the same query
+            results (by filtering whole-day buckets) instead of querying again
+
+    Returns:
+        dict mapping days and each of narrower_days to its processed result
     """
+    all_days = (days, *narrower_days)
     try:
-        session = boto3.Session(profile_name=AWS_PROFILE) if AWS_PROFILE else boto3.Session()
-        logs_client = session.client('logs')
+        logs_client = _get_logs_client()
 
         # Parse days parameter to get start and end times
         start_time, end_time = parse_days_parameter(days)
@@ -1112,13 +1365,22 @@ def get_bedrock_usage(days=7):
         # CloudWatch Logs Insights query - aggregates data server-side
         # Much faster than fetching all events and aggregating in Python
         # Include date breakdown for daily cost tracking
-        query = """
+        # The IAM user / role name is extracted from the ARN server-side so that
+        # rows are grouped per user rather than per ARN (assumed-role ARNs carry a
+        # session name, which otherwise yields one row per session). ARNs that
+        # don't match (e.g. ':root') fall back to the full ARN.
+        # Events without a model or caller would be skipped during processing,
+        # so they are filtered out here instead of being returned as rows.
+        query = r"""
 fields @timestamp, identity.arn, modelId, input.inputTokenCount, input.cacheWriteInputTokenCount, output.outputTokenCount
+| filter ispresent(modelId) and ispresent(identity.arn)
+| parse identity.arn /:(?:user|assumed-role)\/(?<arn_user>[^\/]+)/
+| fields coalesce(arn_user, identity.arn) as iam_user
 | stats count() as invocations,
          sum(input.inputTokenCount) as total_input_tokens,
          sum(input.cacheWriteInputTokenCount) as total_cache_write_tokens,
          sum(output.outputTokenCount) as total_output_tokens
-    by identity.arn, modelId, datefloor(@timestamp, 1d) as date_day
+    by iam_user, modelId, datefloor(@timestamp, 1d) as date_day
         """
 
         try:
@@ -1132,91 +1394,158 @@ fields @timestamp, identity.arn, modelId, input.inputTokenCount, input.cacheWrit
 
             query_id = response['queryId']
 
-            # Poll for query completion (max 60 seconds)
-            max_wait = 60
+            # Poll for query completion (max _QUERY_MAX_WAIT). Status is checked with
+            # the lightweight DescribeQueries call; the (potentially large)
+            # results payload is only downloaded once the query is complete.
+            max_wait = _QUERY_MAX_WAIT
             poll_interval = 1
             elapsed = 0
+            result = None
 
             while elapsed < max_wait:
-                result = logs_client.get_query_results(queryId=query_id)
-                status = result['status']
+                status = _get_query_status(logs_client, log_group_name, query_id)
+                if status is None or status == 'Complete':
+                    result = logs_client.get_query_results(queryId=query_id)
+                    status = result['status']
 
                 if status == 'Complete':
                     break
                 elif status == 'Failed':
-                    raise Exception(f"CloudWatch Logs Insights query failed: {result.get('statistics', {})}")
+                    raise Exception(f"CloudWatch Logs Insights query failed: {(result or {}).get('statistics', {})}")
                 elif status == 'Cancelled':
                     raise Exception("CloudWatch Logs Insights query was cancelled")
 
                 time.sleep(poll_interval)
                 elapsed += poll_interval
+                poll_interval = min(poll_interval * 1.5, 5)
 
             if elapsed >= max_wait:
-                raise Exception("CloudWatch Logs Insights query timeout (> 60 seconds)")
+                raise Exception(f"CloudWatch Logs Insights query timeout (> {max_wait} seconds)")
 
             # Process query results
-            return _process_logs_insights_results(
-                result.get('results', []),
-                start_time,
-                end_time
-            )
+            records = result.get('results', [])
+            usage = {days: _process_logs_insights_results(records, start_time, end_time)}
+
+            # Derive shorter ranges from the day buckets of the same results
+            for narrow_days in narrower_days:
+                narrow_start, narrow_end = parse_days_parameter(narrow_days)
+                first_day = narrow_start.strftime('%Y-%m-%d')
+                # Generator: the processor iterates records once, so no filtered copy is kept
+                narrow_records = (
+                    record for record in records
+                    if next((f['value'] for f in record if f['field'] == 'date_day'), '') >= first_day
+                )
+                usage[narrow_days] = _process_logs_insights_results(narrow_records, narrow_start, narrow_end)
+
+            return usage
 
         except logs_client.exceptions.ResourceNotFoundException:
-            return {
+            error = {
                 'error': f'CloudWatch log group "{log_group_name}" not found. Bedrock model invocation logging may not be enabled in your AWS account. Check AWS Console > CloudWatch > Log groups.',
                 'user_invocations': {},
                 'daily_trend': {},
                 'model_usage': {},
                 'date_range': f'{start_time.strftime("%Y-%m-%d")} to {end_time.strftime("%Y-%m-%d")}'
             }
+            return {d: error for d in all_days}
 
     except Exception as e:
         error_msg = str(e)
+        _reset_aws_clients_on_credential_error(error_msg)
 
         # Provide helpful error messages for common issues
         if 'AccessDenied' in error_msg:
-            error_msg = f'Access Denied: Your AWS credentials do not have permission to access CloudWatch Logs. Required permissions: logs:StartQuery, logs:GetQueryResults. Error: {error_msg}'
+            error_msg = f'Access Denied: Your AWS credentials do not have permission to access CloudWatch Logs. Required permissions: logs:StartQuery, logs:GetQueryResults, logs:DescribeQueries. Error: {error_msg}'
         elif 'ExpiredToken' in error_msg:
             error_msg = 'AWS credentials have expired. Please refresh your credentials.'
         elif 'NoCredentialsError' in error_msg or 'Unable to locate credentials' in error_msg:
             error_msg = 'No AWS credentials found. Configure credentials via AWS CLI (aws configure) or set AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY environment variables.'
 
-        return {
+        error = {
             'error': f'Failed to fetch Bedrock usage data: {error_msg}',
             'user_invocations': {},
             'daily_trend': {},
             'model_usage': {},
             'date_range': 'N/A'
         }
+        return {d: error for d in all_days}
+
+def _nest(flat):
+    """
+    Turn a dict keyed by tuples into nested dicts, e.g.
+    {('alice', 'model', '2025-12-01'): 1.0} -> {'alice': {'model': {'2025-12-01': 1.0}}}.
+    Keys are sorted once up front, so every inner dict comes out in order and
+    consecutive keys sharing a prefix reuse the same inner dict.
+    """
+    nested = {}
+    last_prefix = None
+    for key, value in sorted(flat.items()):
+        prefix = key[:-1]
+        if prefix != last_prefix:
+            inner = nested
+            for part in prefix:
+                inner = inner.setdefault(part, {})
+            last_prefix = prefix
+        inner[key[-1]] = value
+    return nested
+
+def _in_day_order(by_day, all_days):
+    """
+    Return by_day (keyed by 'YYYY-MM-DD') ordered by date, walking the known
+    list of days in the range instead of sorting. Falls back to sorting if
+    some date lies outside all_days, so nothing is dropped.
+    """
+    ordered = {day: by_day[day] for day in all_days if day in by_day}
+    if len(ordered) != len(by_day):
+        return dict(sorted(by_day.items()))
+    return ordered
+
+def _username_from_arn(user_arn):
+    """
+    Extract the IAM user or role name from an ARN.
+    Examples:
+        'arn:aws:iam::123456789012:user/bedrock-peterdir'           -> 'bedrock-peterdir'
+        'arn:aws:sts::123456789012:assumed-role/dirkcli/session'    -> 'dirkcli'
+        'arn:aws:iam::123456789012:root'                            -> 'root'
+    Values that are already plain names are returned unchanged.
+    """
+    # assumed-role first: it is the common case, and a role name such as
+    # 'poweruser' would otherwise be caught by the 'user/' check
+    _, sep, rest = user_arn.partition('assumed-role/')
+    if sep:
+        return rest.partition('/')[0]
+    _, sep, rest = user_arn.partition('user/')
+    if sep:
+        return rest.partition('/')[0]
+    if ':root' in user_arn:
+        return 'root'
+    return user_arn
+
+@lru_cache(maxsize=4096)
+def _resolve_user(user_arn):
+    """Map an iam_user value from the query to its normalized dashboard username"""
+    return normalize_username(_username_from_arn(user_arn))
 
 def _process_logs_insights_results(records, start_time, end_time):
     """
     Process aggregated results from CloudWatch Logs Insights query.
-    Records are already aggregated by identity.arn, modelId, and date_day.
+    Records are already aggregated by iam_user (IAM user/role name, or the full
+    ARN when no name could be extracted), modelId, and date_day. They may be
+    any iterable (e.g. a generator); they are consumed in a single pass.
 
     Note: This function tracks invocations and tokens from CloudWatch logs.
     Actual costs are fetched separately from AWS Cost Explorer for accuracy.
     """
-    # Initialize data structures
-    user_invocations = defaultdict(int)
-    daily_trend = defaultdict(int)
-    model_usage = defaultdict(int)
-
+    # Only the finest-grained rollups are updated per record; the per-user,
+    # per-model and per-day totals are derived from them afterwards.
+    # Flat dicts keyed by tuples: one hash per update and no per-user inner dicts.
+    user_model_daily_invocations = {}  # (user, model, date) -> invocations
     # Token tracking (costs come from Cost Explorer, not calculated here)
-    user_tokens = defaultdict(lambda: {'input': 0, 'output': 0})
-    model_tokens = defaultdict(lambda: {'input': 0, 'output': 0})
-    model_invocations = defaultdict(int)
-
-    # Track user's share of invocations per model (for cost allocation)
-    user_model_invocations = defaultdict(lambda: defaultdict(int))
-    user_daily_invocations = defaultdict(lambda: defaultdict(int))
-    user_model_daily_invocations = defaultdict(lambda: defaultdict(lambda: defaultdict(int)))
+    user_model_input_tokens = {}   # (user, model) -> input tokens
+    user_model_output_tokens = {}  # (user, model) -> output tokens
 
     total_events = 0
 
-    # Cache for stripped model prefixes to avoid redundant work
-    model_prefix_cache = {}
-
     # Process each aggregated record
     for record in records:
         # Convert record list to dict for easier access
@@ -1224,11 +1553,12 @@ def _process_logs_insights_results(records, start_time, end_time):
 
         try:
             # Extract fields - they're already strings from CloudWatch
-            user_arn = fields.get('identity.arn', 'Unknown')
+            user_arn = fields.get('iam_user', 'Unknown')
             model_id = fields.get('modelId', 'Unknown')
             date_day = fields.get('date_day', 'Unknown')
 
-            # Skip records with Unknown user or model
+            # Skip records with Unknown user or model; this keeps Unknown
+            # out of every aggregate, so no filtering is needed afterwards
             if user_arn == 'Unknown' or model_id == 'Unknown':
                 continue
 
@@ -1241,45 +1571,24 @@ def _process_logs_insights_results(records, start_time, end_time):
             total_input_tokens = input_tokens + cache_write_tokens
             total_output_tokens = output_tokens
 
-            # Extract user name from ARN (optimized)
-            if 'user/' in user_arn:
-                raw_user = user_arn.split('user/', 1)[1].split('/')[0]
-            elif 'assumed-role/' in user_arn:
-                raw_user = user_arn.split('assumed-role/', 1)[1].split('/')[0]
-            elif ':root' in user_arn:
-                raw_user = 'root'
-            else:
-                raw_user = user_arn
-
-            # Normalize username (remove bedrock- prefix and apply alias mapping)
-            user = normalize_username(raw_user)
+            # Resolve and normalize the user (the query already extracts
+            # names from user/ and assumed-role/ ARNs)
+            user = _resolve_user(user_arn)
 
-            # Canonicalize model id (with caching) so usage joins with Cost
+            # Canonicalize model id (cached) so usage joins with Cost
             # Explorer costs on the same key, regardless of region/version suffix.
-            if model_id not in model_prefix_cache:
-                model_prefix_cache[model_id] = canonical_model_id(model_id)
-            clean_model_id = model_prefix_cache[model_id]
+            clean_model_id = canonical_model_id(model_id)
 
             # Normalize date format to YYYY-MM-DD (Cost Explorer format)
             # CloudWatch returns dates like '2025-12-02 00:00:00.000'
             normalized_date = date_day.split(' ')[0] if ' ' in date_day else date_day
 
-            # Aggregate invocation data
-            user_invocations[user] += invocations
-            model_usage[clean_model_id] += invocations
-            daily_trend[normalized_date] += invocations
-            model_invocations[clean_model_id] += invocations
-
-            # Aggregate tokens
-            user_tokens[user]['input'] += total_input_tokens
-            user_tokens[user]['output'] += total_output_tokens
-            model_tokens[clean_model_id]['input'] += total_input_tokens
-            model_tokens[clean_model_id]['output'] += total_output_tokens
-
-            # Track user's share of model invocations (for cost allocation)
-            user_model_invocations[user][clean_model_id] += invocations
-            user_daily_invocations[user][normalized_date] += invocations
-            user_model_daily_invocations[user][clean_model_id][normalized_date] += invocations
+            # Aggregate invocations and tokens
+            key = (user, clean_model_id, normalized_date)
+            user_model_daily_invocations[key] = user_model_daily_invocations.get(key, 0) + invocations
+            key = (user, clean_model_id)
+            user_model_input_tokens[key] = user_model_input_tokens.get(key, 0) + total_input_tokens
+            user_model_output_tokens[key] = user_model_output_tokens.get(key, 0) + total_output_tokens
 
             total_events += invocations
 
@@ -1287,6 +1596,35 @@ def _process_logs_insights_results(records, start_time, end_time):
             # Skip malformed records
             continue
 
+    # Derive the coarser rollups from the (user, model, date) counts
+    user_invocations = {}
+    model_invocations = {}
+    daily_trend = {}
+    # Track user's share of invocations per model (for cost allocation)
+    user_model_invocations = {}   # (user, model) -> invocations
+    # Per-model daily totals, the denominators for daily cost allocation
+    model_daily_invocations = {}  # (model, date) -> invocations
+    for (user, model_id, date), invocations in user_model_daily_invocations.items():
+        user_invocations[user] = user_invocations.get(user, 0) + invocations
+        model_invocations[model_id] = model_invocations.get(model_id, 0) + invocations
+        daily_trend[date] = daily_trend.get(date, 0) + invocations
+        key = (user, model_id)
+        user_model_invocations[key] = user_model_invocations.get(key, 0) + invocations
+        key = (model_id, date)
+        model_daily_invocations[key] = model_daily_invocations.get(key, 0) + invocations
+    model_usage = model_invocations
+
+    user_input_tokens = {}
+    model_input_tokens = {}
+    for (user, model_id), tokens in user_model_input_tokens.items():
+        user_input_tokens[user] = user_input_tokens.get(user, 0) + tokens
+        model_input_tokens[model_id] = model_input_tokens.get(model_id, 0) + tokens
+    user_output_tokens = {}
+    model_output_tokens = {}
+    for (user, model_id), tokens in user_model_output_tokens.items():
+        user_output_tokens[user] = user_output_tokens.get(user, 0) + tokens
+        model_output_tokens[model_id] = model_output_tokens.get(model_id, 0) + tokens
+
     # Check if we found any data
     if not user_invocations:
         return {
@@ -1297,98 +1635,91 @@ def _process_logs_insights_results(records, start_time, end_time):
             'date_range': f'{start_time.strftime("%Y-%m-%d")} to {end_time.strftime("%Y-%m-%d")}'
         }
 
-    # Filter out "Unknown" entries from all dictionaries
-    user_invocations = {u: v for u, v in user_invocations.items() if u != 'Unknown'}
-    model_usage = {m: v for m, v in model_usage.items() if m != 'Unknown'}
-    user_tokens = {u: v for u, v in user_tokens.items() if u != 'Unknown'}
-    model_tokens = {m: v for m, v in model_tokens.items() if m != 'Unknown'}
-    model_invocations = {m: v for m, v in model_invocations.items() if m != 'Unknown'}
-    user_model_invocations = {u: {m: v for m, v in mi.items() if m != 'Unknown'}
-                              for u, mi in user_model_invocations.items() if u != 'Unknown'}
-
     # Calculate total tokens
-    total_input_tokens = sum(t['input'] for t in user_tokens.values())
-    total_output_tokens = sum(t['output'] for t in user_tokens.values())
+    total_input_tokens = sum(user_input_tokens.values())
+    total_output_tokens = sum(user_output_tokens.values())
 
     # Fetch actual costs from Cost Explorer
     ce_costs = get_cost_explorer_costs(start_time, end_time)
 
     # Allocate costs to users based on their share of model invocations
-    user_costs = defaultdict(float)
+    user_costs = {}
     model_costs = ce_costs.get('model_costs', {})
     daily_costs = ce_costs.get('daily_costs', {})
-    user_model_costs = defaultdict(lambda: defaultdict(float))
-    user_daily_costs = defaultdict(lambda: defaultdict(float))
-    user_model_daily_costs = defaultdict(lambda: defaultdict(lambda: defaultdict(float)))
-
-    # For each model, allocate cost to users based on their invocation share
-    for model_id, total_model_cost in model_costs.items():
-        # Get total invocations for this model
-        total_model_invocations = model_invocations.get(model_id, 0)
-
-        if total_model_invocations > 0:
-            # Allocate cost to each user based on their share of invocations
-            for user, user_models in user_model_invocations.items():
-                user_model_inv = user_models.get(model_id, 0)
-                if user_model_inv > 0:
-                    # User's share of this model's cost
-                    user_share = user_model_inv / total_model_invocations
-                    allocated_cost = total_model_cost * user_share
-                    user_costs[user] += allocated_cost
-                    user_model_costs[user][model_id] += allocated_cost
-
-    # Allocate daily costs to users based on their daily invocation share
+    user_model_costs = {}        # (user, model) -> cost
+    user_daily_costs = {}        # (user, date) -> cost
+    user_model_daily_costs = {}  # (user, model, date) -> cost
+
+    # Cost per invocation for each model, so allocating a (user, model) share
+    # is a single multiply: cost * (inv / total) == inv * (cost / total)
+    model_rates = {}
+    for model_id, total_model_invocations in model_invocations.items():
+        total_model_cost = model_costs.get(model_id)
+        if total_model_cost is not None and total_model_invocations > 0:
+            model_rates[model_id] = total_model_cost / total_model_invocations
+
+    # For each (user, model) pair, allocate the model's cost by invocation share
+    for (user, model_id), user_model_inv in user_model_invocations.items():
+        rate = model_rates.get(model_id)
+        if rate is not None and user_model_inv > 0:
+            allocated_cost = user_model_inv * rate
+            user_costs[user] = user_costs.get(user, 0.0) + allocated_cost
+            key = (user, model_id)
+            user_model_costs[key] = user_model_costs.get(key, 0.0) + allocated_cost
+
+    # Same for daily costs: cost per invocation for each (model, date)
     model_daily_costs = ce_costs.get('model_daily_costs', {})
-    for model_id, daily_model_costs in model_daily_costs.items():
-        for date, day_cost in daily_model_costs.items():
-            # Get total invocations for this model on this day
-            total_day_inv = sum(
-                user_model_daily_invocations.get(u, {}).get(model_id, {}).get(date, 0)
-                for u in user_invocations.keys()
-            )
-
+    daily_rates = {}
+    for model_id, day_costs in model_daily_costs.items():
+        for date, day_cost in day_costs.items():
+            total_day_inv = model_daily_invocations.get((model_id, date), 0)
             if total_day_inv > 0:
-                for user in user_invocations.keys():
-                    user_day_inv = user_model_daily_invocations.get(user, {}).get(model_id, {}).get(date, 0)
-                    if user_day_inv > 0:
-                        user_share = user_day_inv / total_day_inv
-                        allocated_cost = day_cost * user_share
-                        user_daily_costs[user][date] += allocated_cost
-                        user_model_daily_costs[user][model_id][date] += allocated_cost
+                daily_rates[(model_id, date)] = day_cost / total_day_inv
+
+    # Allocate daily costs to users based on their daily invocation share
+    for (user, model_id, date), user_day_inv in user_model_daily_invocations.items():
+        rate = daily_rates.get((model_id, date))
+        if rate is not None and user_day_inv > 0:
+            allocated_cost = user_day_inv * rate
+            key = (user, date)
+            user_daily_costs[key] = user_daily_costs.get(key, 0.0) + allocated_cost
+            key = (user, model_id, date)
+            user_model_daily_costs[key] = user_model_daily_costs.get(key, 0.0) + allocated_cost
 
     total_cost = ce_costs.get('total_cost', 0.0)
 
-    return {
+    # Every day in the range, in order, for the day-keyed outputs
+    first_day = start_time.date()
+    all_days = [(first_day + timedelta(days=i)).strftime('%Y-%m-%d')
+                for i in range((end_time.date() - first_day).days + 1)]
+
+    result = {
         'user_invocations': dict(user_invocations),
-        'daily_trend': dict(sorted(daily_trend.items())),
+        'daily_trend': _in_day_order(daily_trend, all_days),
         'model_usage': dict(model_usage),
         'date_range': f'{start_time.strftime("%Y-%m-%d")} to {end_time.strftime("%Y-%m-%d")}',
         'total_events': total_events,
 
         # Token data (from CloudWatch logs)
-        'user_tokens': {user: dict(tokens) for user, tokens in user_tokens.items()},
-        'model_tokens': {model: dict(tokens) for model, tokens in model_tokens.items()},
+        'user_tokens': {user: {'input': tokens, 'output': user_output_tokens[user]}
+                        for user, tokens in user_input_tokens.items()},
+        'model_tokens': {model: {'input': tokens, 'output': model_output_tokens[model]}
+                         for model, tokens in model_input_tokens.items()},
         'model_invocations': dict(model_invocations),
 
         # Cost data (from Cost Explorer, allocated to users by invocation share)
         'user_costs': dict(user_costs),
         'model_costs': dict(model_costs),
-        'daily_costs': dict(sorted(daily_costs.items())),
+        'daily_costs': dict(daily_costs),  # already sorted by get_cost_explorer_costs
 
         # Per-user daily costs
-        'user_daily_costs': {user: dict(sorted(costs.items())) for user, costs in user_daily_costs.items()},
+        'user_daily_costs': _nest(user_daily_costs),
 
         # Per-user per-model costs (for cost matrix)
-        'user_model_costs': {user: dict(costs) for user, costs in user_model_costs.items()},
+        'user_model_costs': _nest(user_model_costs),
 
         # Per-user per-model per-day costs (for daily chart)
-        'user_model_daily_costs': {
-            user: {
-                model: dict(sorted(daily.items()))
-                for model, daily in models.items()
-            }
-            for user, models in user_model_daily_costs.items()
-        },
+        'user_model_daily_costs': _nest(user_model_daily_costs),
 
         # Summary totals
         'total_input_tokens': total_input_tokens,
@@ -1398,6 +1729,70 @@ def _process_logs_insights_results(records, start_time, end_time):
         # Source indicator
         'cost_source': 'AWS Cost Explorer'
     }
+    # Usage is still shown when Cost Explorer fails, but the failure is passed
+    # on so the result isn't cached with zero costs
+    if 'error' in ce_costs:
+        result['cost_error'] = ce_costs['error']
+    return result
+
+# API responses may be reused by the browser briefly (e.g. when switching
+# between pages) and revalidated with the ETag afterwards
+_API_CACHE_CONTROL = 'private, max-age=60, stale-while-revalidate=600'
+
+# JSON responses at least this large are gzip-compressed for clients that
+# accept it; the repetitive user/model/day JSON compresses roughly 10:1
+_GZIP_MIN_SIZE = 1024
+
+# The Lambda handler decodes response bodies as UTF-8 text, so compression is
+# left to API Gateway there
+_IS_LAMBDA = 'AWS_LAMBDA_FUNCTION_NAME' in os.environ
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+def _json_response(data):
+    """
+    Serialize data to a JSON response with orjson, which is several times faster
+    than the stdlib json used by jsonify on the large usage payloads. Keys are
+    sorted and non-string keys stringified to match jsonify's output. Falls back
+    to jsonify without orjson.
+    """
+    if orjson is None:
+        return jsonify(data)
+    return Response(orjson.dumps(data, option=_ORJSON_OPTIONS), mimetype='application/json')
+
+def _cacheable_json(data):
+    """JSON response with Cache-Control and ETag headers; answers If-None-Match with 304"""
+    response = _json_response(data)
+    if not _is_cacheable(data):
+        return response
+    response.headers['Cache-Control'] = _API_CACHE_CONTROL
+    response.add_etag()
+    return response.make_conditional(request)
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON responses when the client accepts it"""
+    if (_IS_LAMBDA
+            or response.status_code != 200
+            or response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in request.headers.get('Accept-Encoding', '').lower()):
+        return response
+
+    data = response.get_data()
+    if len(data) < _GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    # The compressed body differs byte-for-byte, so the ETag can only be weak
+    etag, _ = response.get_etag()
+    if etag:
+        response.set_etag(etag, weak=True)
+    return response
 
 @app.route('/')
 def index():
@@ -1405,7 +1800,7 @@ def index():
     access_check = check_subnet_access()
     if access_check is not True:
         return access_check
-    return render_template_string(HTML_TEMPLATE, code_updated_date=CODE_UPDATED_DATE)
+    return _HTML_TMPL.render(code_updated_date=CODE_UPDATED_DATE)
 
 @app.route('/api/usage')
 def usage_api():
@@ -1414,7 +1809,8 @@ def usage_api():
     if access_check is not True:
         return access_check
     days = request.args.get('days', '7')  # Keep as string, parse_days_parameter handles conversion
-    data = get_bedrock_usage(days)
+    refresh = request.args.get('refresh') == '1'  # ?refresh=1 bypasses the results cache
+    data = get_bedrock_usage(days, refresh=refresh)
 
     # Add model display names for friendly UI display
     if 'model_costs' in data and data['model_costs']:
@@ -1451,7 +1847,7 @@ def usage_api():
         for user, models in data.get('user_model_daily_costs', {}).items()
     }
 
-    return jsonify(data)
+    return _cacheable_json(data)
 
 @app.route('/api/cost-matrix')
 def cost_matrix_api():
@@ -1465,10 +1861,11 @@ def cost_matrix_api():
         return access_check
 
     days = request.args.get('days', '7')  # Keep as string, parse_days_parameter handles conversion
-    data = get_bedrock_usage(days)
+    refresh = request.args.get('refresh') == '1'  # ?refresh=1 bypasses the results cache
+    data = get_bedrock_usage(days, refresh=refresh)
 
     if 'error' in data:
-        return jsonify(data)
+        return _json_response(data)
 
     # Extract user_model_costs
     user_model_costs = data.get('user_model_costs', {})
@@ -1491,26 +1888,25 @@ def cost_matrix_api():
         'model_totals': {}  # Total cost per model
     }
 
-    # Populate the matrix
+    # Populate the matrix, accumulating model totals in the same pass
+    model_totals = dict.fromkeys(all_models, 0)
     for user in all_users:
-        row = []
-        user_total = 0
-        for model in all_models:
-            cost = user_model_costs.get(user, {}).get(model, 0)
-            row.append(round(cost, 4))  # Round to 4 decimal places
-            user_total += cost
+        costs = user_model_costs[user]
+        row = [round(costs.get(model, 0), 4) for model in all_models]  # Round to 4 decimal places
         matrix['data'].append(row)
-        matrix['user_totals'][user] = round(user_total, 4)
+        matrix['user_totals'][user] = round(sum(costs.values()), 4)
+        for model, cost in zip(all_models, row):
+            model_totals[model] += cost
 
-    # Calculate model totals
-    for model_idx, model in enumerate(all_models):
-        model_total = sum(matrix['data'][user_idx][model_idx] for user_idx in range(len(all_users)))
-        matrix['model_totals'][model] = round(model_total, 4)
+    # Model totals are sums of the rounded cells, as shown in the table
+    matrix['model_totals'] = {model: round(total, 4) for model, total in model_totals.items()}
 
     matrix['date_range'] = data.get('date_range', '')
     matrix['total_cost'] = data.get('total_cost', 0)
+    if 'cost_error' in data:
+        matrix['cost_error'] = data['cost_error']
 
-    return jsonify(matrix)
+    return _cacheable_json(matrix)
 
 def format_price(price):
     """Format price removing unnecessary trailing zeros"""
@@ -1521,29 +1917,8 @@ def format_price(price):
     else:
         return f"{price:.6f}".rstrip('0').rstrip('.')
 
-@app.route('/more-stats')
-def more_stats_page():
-    """Serve the more stats page with detailed cost analysis"""
-    access_check = check_subnet_access()
-    if access_check is not True:
-        return access_check
-    return render_template_string(MORE_STATS_TEMPLATE)
-
-@app.route('/matrix')
-def matrix_page():
-    """Serve the cost matrix page (backward compatibility redirect)"""
-    access_check = check_subnet_access()
-    if access_check is not True:
-        return access_check
-    return render_template_string(MATRIX_TEMPLATE)
-
-@app.route('/pricing')
-def pricing_page():
-    """Serve the pricing table page"""
-    access_check = check_subnet_access()
-    if access_check is not True:
-        return access_check
-
+def _build_pricing_data():
+    """Build the rows of the pricing table from the static pricing dictionaries"""
     # Vendor icons mapping
     vendor_icons = {
         'anthropic': '🤖',
@@ -1584,8 +1959,8 @@ def pricing_page():
 
         # Strip region prefix (e.g., "global.", "us.", "eu.", "ap.")
         display_model_id = model_id
-        if model_id.startswith(('global.', 'us.', 'eu.', 'ap.')):
-            display_model_id = model_id.split('.', 1)[1]
+        if model_id.startswith(_REGION_PREFIXES):
+            display_model_id = model_id.partition('.')[2]
 
         # Extract vendor from model ID
         if '.' in display_model_id:
@@ -1616,7 +1991,35 @@ def pricing_page():
     # Sort by input price (most expensive first)
     pricing_data.sort(key=lambda x: x['input_price_raw'], reverse=True)
 
-    return render_template_string(PRICING_TEMPLATE, pricing_data=pricing_data)
+    return pricing_data
+
+# The pricing tables never change at runtime, so the rows are built once
+_PRICING_DATA_CACHED = _build_pricing_data()
+
+@app.route('/more-stats')
+def more_stats_page():
+    """Serve the more stats page with detailed cost analysis"""
+    access_check = check_subnet_access()
+    if access_check is not True:
+        return access_check
+    return _MORE_STATS_TMPL.render()
+
+@app.route('/matrix')
+def matrix_page():
+    """Serve the cost matrix page (backward compatibility redirect)"""
+    access_check = check_subnet_access()
+    if access_check is not True:
+        return access_check
+    return _MATRIX_TMPL.render()
+
+@app.route('/pricing')
+def pricing_page():
+    """Serve the pricing table page"""
+    access_check = check_subnet_access()
+    if access_check is not True:
+        return access_check
+
+    return _PRICING_TMPL.render(pricing_data=_PRICING_DATA_CACHED)
 
 if __name__ == '__main__':
     # Parse command-line arguments
@@ -1628,4 +2031,11 @@ if __name__ == '__main__':
 
     print("Starting Bedrock Usage Dashboard...")
     print(f"Open http://localhost:{args.port} in your browser")
+
+    # Keep the results cache warm if enabled. With debug=True the reloader runs the
+    # app in a child process (WERKZEUG_RUN_MAIN=true); only prewarm there, not in the
+    # watcher. Not used on Lambda, where background threads are frozen between invocations.
+    if CFG.PREWARM_CACHE and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_cache_prewarm()
+
     app.run(debug=True, host='0.0.0.0', port=args.port)